@@ -36,6 +36,13 @@ def iterate_over_data_class(
 
     Yields:
         Iterator[NodeElement]: The node elements over a list of ordered NodeElements
+
+    Raises:
+        ValueError: If a value to traverse is no dataclass. The nested
+                    dataclasses are resolved while iterating, so the
+                    iterator raises it as well, if a collection of
+                    dataclasses holds another value or if a dataclass
+                    is part of its own hierarchy.
     """
     return iter(DataClassIterable(mode, dataclass))
 
@@ -58,8 +65,15 @@ def iterate_over_data_classes(
 
     Yields:
         Iterator[NodeElement]: The node elements over a list of ordered NodeElements
+
+    Raises:
+        ValueError: If a value to traverse is no dataclass. The nested
+                    dataclasses are resolved while iterating, so the
+                    iterator raises it as well, if a collection of
+                    dataclasses holds another value or if a dataclass
+                    is part of its own hierarchy.
     """
-    return iter(DataClassIterable(mode, dataclasses))
+    return iter(DataClassIterable(mode, *dataclasses))
 
 
 def flatten_hierarchy(
@@ -75,11 +89,10 @@ def flatten_hierarchy(
 
     Returns:
         List[NodeElement]: The list of NodeElements.
+
+    Raises:
+        ValueError: If the value is no dataclass, if a nested collection
+                    of dataclasses holds another value or if a dataclass
+                    is part of its own hierarchy.
     """
-    result: List[NodeElement] = []
-    nodes: Iterator[NodeElement] = iterate_over_data_class(dataclass, mode)
-    try:
-        while True:
-            result.append(next(nodes))
-    except StopIteration:
-        return result
+    return list(iterate_over_data_class(dataclass, mode))
@@ -12,47 +12,30 @@
    will be iterated.
 """
 
-from dataclasses import field, dataclass
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
 from typing import (
-    Iterable,
+    Any,
+    Callable,
+    Dict,
     Iterator,
     Optional,
+    Set,
     TypeVar,
     Generic,
-    Set,
-    Union,
     Tuple,
     List,
 )
-from collections import deque
 from enum import Enum, auto
-from sys import version_info
 
-from .tree import Tree, Node, create_tree_from_dataclass
+from .tree import Node, _create_child_nodes, _create_root_node
 from .visitor import NodeElement
 
 
-_DO_NOT_ITERATE_OVER_NODE_: str = "iteratedc_skip"
-
-
-if version_info.major == 3 and version_info.minor <= 8:
-    from typing import Deque  # pylint: disable=C0412
-else:
-    Deque = deque
-
-
 DataClassType: TypeVar = TypeVar("DataClassType")
 
 
-@dataclass
-class _RootNode:
-    nodes: Iterable[str] = field(metadata={_DO_NOT_ITERATE_OVER_NODE_: True})
-
-
-_DataClassNodeType = Union[_RootNode, DataClassType]
-
-
 class IterationMode(Enum):
     """Represents the mode of operation to use for tree traversal.
     """
@@ -74,176 +57,205 @@ class IterationMode(Enum):
     """
 
 
-OrderedNodeCollection = Deque[Tuple[Node, Deque[Node]]]
+AncestorLink = Optional[Tuple[Node, Any]]
+"""The chain of ancestors of a node as persistent linked list. Each link
+   holds the direct parent node and the link of the parent node.
+"""
+
+OrderedNode = Tuple[Node, AncestorLink]
+
+
+def _materialize(node: Node, link: AncestorLink) -> Tuple[Node, ...]:
+    ancestors: List[Node] = []
+    while link is not None:
+        ancestor, link = link
+        if ancestor.item is node.item:
+            raise ValueError(node.item, " is part of its own hierarchy")
+        ancestors.append(ancestor)
+
+    ancestors.reverse()
+    return tuple(ancestors)
+
+
+def _check_not_cyclic(child: Node, path_ids: Set[int]) -> None:
+    if id(child.item) in path_ids:
+        raise ValueError(child.item, " is part of its own hierarchy")
+
+
+def _iter_children(node: Node, reverse_children: bool) -> Iterator[Node]:
+    children: Tuple[Node, ...] = _create_child_nodes(node)
+    return reversed(children) if reverse_children else iter(children)
+
+
+def _iter_post_order(
+    roots: Tuple[Node, ...], reverse_children: bool
+) -> Iterator[OrderedNode]:
+    # Each frame holds the pending children and the link they will carry.
+    # That link is the (node, parent link) pair of the frame's own node.
+    work: List[Tuple[Iterator[Node], AncestorLink]] = [
+        (reversed(roots) if reverse_children else iter(roots), None)
+    ]
+    # Ids of the values on the current path, used to detect cycles
+    path_ids: Set[int] = set()
+
+    while len(work) > 0:
+        children, link = work[-1]
+        child: Optional[Node] = next(children, None)
+        if child is not None:
+            _check_not_cyclic(child, path_ids)
+            path_ids.add(id(child.item))
+            work.append(
+                (_iter_children(child, reverse_children), (child, link))
+            )
+        else:
+            work.pop()
+            if link is not None:
+                path_ids.discard(id(link[0].item))
+                yield link
+
+
+def _iter_pre_order(
+    roots: Tuple[Node, ...], reverse_children: bool
+) -> Iterator[OrderedNode]:
+    # Each frame holds the pending children and the link they will carry
+    work: List[Tuple[Iterator[Node], AncestorLink]] = [
+        (reversed(roots) if reverse_children else iter(roots), None)
+    ]
+
+    while len(work) > 0:
+        children, link = work[-1]
+        child: Optional[Node] = next(children, None)
+        if child is not None:
+            yield child, link
+            work.append(
+                (_iter_children(child, reverse_children), (child, link))
+            )
+        else:
+            work.pop()
 
 
 class _DataClassIteratorBase(ABC):  # pylint: disable=R0903
-    def __init__(self, tree: Tree) -> None:
+    def __init__(self, roots: Tuple[Node, ...]) -> None:
         super().__init__()
-        if tree is None:
-            raise ValueError(tree, " must not be none")
+        if roots is None:
+            raise ValueError(roots, " must not be none")
 
-        self.__tree: Tree = tree
+        self.__roots: Tuple[Node, ...] = roots
         self.__node_element_iterator: Optional[Iterator[NodeElement]] = None
 
     @property
-    def _tree(self) -> Tree:
-        return self.__tree
+    def _roots(self) -> Tuple[Node, ...]:
+        return self.__roots
+
+    def __iter__(self) -> Iterator[NodeElement]:
+        return self
 
     def __next__(self) -> NodeElement:
         if self.__node_element_iterator is None:
-            elements: Iterable[NodeElement] = self.__build()
-            self.__node_element_iterator = iter(elements)
+            self.__node_element_iterator = self.__build()
 
         return next(self.__node_element_iterator)
 
     @abstractmethod
-    def _build_ordered_node_collection(self) -> OrderedNodeCollection:
+    def _iter_ordered_nodes(self) -> Iterator[OrderedNode]:
         pass
 
-    def __build(self) -> Iterable[NodeElement]:
-        items: List[NodeElement] = []
-
-        ordered_raw_items: OrderedNodeCollection = self._build_ordered_node_collection()
-
-        for item in ordered_raw_items:
-            node, parent_nodes = item
-            items.append(NodeElement(node, parent_nodes))
-
-        return items
+    def __build(self) -> Iterator[NodeElement]:
+        for node, link in self._iter_ordered_nodes():
+            # Also rejects a value repeated on its own ancestor path
+            yield NodeElement(node, _materialize(node, link))
 
 
 class _BreathFirstDataClassIterator(_DataClassIteratorBase):
-    def _build_ordered_node_collection(self) -> OrderedNodeCollection:
-        result: OrderedNodeCollection = deque()
-        nodes_to_traverse: OrderedNodeCollection = deque()
-        visited: Set[Node] = set()
-
-        nodes_to_traverse.append((self._tree.root, deque()))
-
-        while len(nodes_to_traverse) > 0:
-            current, stack = nodes_to_traverse.popleft()
-            if current not in visited:
-                visited.add(current)
-                result.append((current, stack))
-                next_stack: Deque[Node] = deque(stack)
-                next_stack.append(current)
-                nodes_to_traverse.extend(
-                    [(c, next_stack) for c in current.children]
-                )
-
-        return result
+    def _iter_ordered_nodes(self) -> Iterator[OrderedNode]:
+        nodes_to_traverse: List[OrderedNode] = [
+            (root, None) for root in self._roots
+        ]
+        head: int = 0
+
+        while head < len(nodes_to_traverse):
+            current, link = nodes_to_traverse[head]
+            head = head + 1
+            yield current, link
+            next_link: AncestorLink = (current, link)
+            nodes_to_traverse.extend(
+                (c, next_link) for c in _create_child_nodes(current)
+            )
+            if head > len(nodes_to_traverse) // 2:
+                # Drop consumed entries once they outweigh the pending ones
+                del nodes_to_traverse[:head]
+                head = 0
 
 
 class _PostOrderDepthFirstDataClassIterator(_DataClassIteratorBase):
-    def __init__(self, tree: Tree, reverse: bool) -> None:
-        super().__init__(tree)
+    def __init__(self, roots: Tuple[Node, ...], reverse: bool) -> None:
+        super().__init__(roots)
         self.__reverse = reverse
 
-    def _build_ordered_node_collection(self) -> OrderedNodeCollection:
-        result: OrderedNodeCollection = _PostOrderDepthFirstDataClassIterator._build_queue(
-            self._tree.root, deque(), set()
-        )
-
+    def _iter_ordered_nodes(self) -> Iterator[OrderedNode]:
         if not self.__reverse:
-            return result
-
-        result.reverse()
-        return result
-
-    @staticmethod
-    def _build_queue(
-        node: Node, stack: Deque[Node], visited: Set[Node]
-    ) -> OrderedNodeCollection:
-        if not node in visited:
-            visited.add(node)
-            result: OrderedNodeCollection = deque()
-            stack.append(node)
-            for child in node.children:
-                next_items = _PostOrderDepthFirstDataClassIterator._build_queue(
-                    child, stack, visited
-                )
-                result.extend(next_items)
-            stack.pop(node)
-            result.append((node, deque(stack)))
-
-        return deque()
+            return _iter_post_order(self._roots, False)
+
+        # Reverse post-order equals pre-order with reversed children
+        return _iter_pre_order(self._roots, True)
 
 
 class _PreOrderDepthFirstDataClassIterator(_DataClassIteratorBase):
-    def __init__(self, tree: Tree, reverse: bool) -> None:
-        super().__init__(tree)
+    def __init__(self, roots: Tuple[Node, ...], reverse: bool) -> None:
+        super().__init__(roots)
         self.__reverse = reverse
 
-    def _build_ordered_node_collection(self) -> OrderedNodeCollection:
-        result: OrderedNodeCollection = _PreOrderDepthFirstDataClassIterator._build_queue(
-            self._tree.root, deque(), set()
-        )
-
+    def _iter_ordered_nodes(self) -> Iterator[OrderedNode]:
         if not self.__reverse:
-            return result
-
-        result.reverse()
-        return result
-
-    @staticmethod
-    def _build_queue(
-        node: Node, stack: Deque[Node], visited: Set[Node]
-    ) -> OrderedNodeCollection:
-        if not node in visited:
-            visited.add(node)
-            result: OrderedNodeCollection = deque()
-            result.append((node, deque(stack)))
-            stack.append(node)
-            for child in node.children:
-                next_items = _PreOrderDepthFirstDataClassIterator._build_queue(
-                    child, stack, visited
-                )
-                result.extend(next_items)
-            stack.pop(node)
-
-        return deque()
+            return _iter_pre_order(self._roots, False)
+
+        # Reverse pre-order equals post-order with reversed children
+        return _iter_post_order(self._roots, True)
+
+
+_IteratorFactory = Callable[[Tuple[Node, ...]], _DataClassIteratorBase]
+
+
+_ITER_FACTORIES: Dict[IterationMode, _IteratorFactory] = {
+    IterationMode.BREAD_FIRST_SEARCH: _BreathFirstDataClassIterator,
+    IterationMode.POST_ORDER_DEPTH_FIRST_SEARCH: lambda roots: (
+        _PostOrderDepthFirstDataClassIterator(roots, False)
+    ),
+    IterationMode.PRE_ORDER_DEPTH_FIRST_SEARCH: lambda roots: (
+        _PreOrderDepthFirstDataClassIterator(roots, False)
+    ),
+    IterationMode.REVERSE_POST_ORDER_DEPTH_FIRST_SEARCH: lambda roots: (
+        _PostOrderDepthFirstDataClassIterator(roots, True)
+    ),
+    IterationMode.REVERSE_PRE_ORDER_DEPTH_FIRST_SEARCH: lambda roots: (
+        _PreOrderDepthFirstDataClassIterator(roots, True)
+    ),
+}
 
 
 class DataClassIterable(Generic[DataClassType]):
-    """Class transforming a dataclass into an iterable of NodeElements
+    """Class transforming a dataclass into an iterable of NodeElements.
+       The fields of the dataclasses are read while iterating, so each
+       iteration reflects the current state of the hierarchy.
     """
 
     def __init__(self, mode: IterationMode, *args: DataClassType) -> None:
         super().__init__()
 
-        work_tree: _DataClassNodeType = args[0] if len(
-            args
-        ) == 1 else _RootNode(args)
-        tree: Optional[Tree] = create_tree_from_dataclass(work_tree)
-        if tree is None:
-            raise ValueError(args, " must be a dataclass")
+        roots: List[Node] = []
+        for data_class in args:
+            root: Optional[Node] = _create_root_node(data_class)
+            if root is None:
+                raise ValueError(data_class, " must be a dataclass")
+            roots.append(root)
 
-        self.__tree: Tree = tree
+        self.__roots: Tuple[Node, ...] = tuple(roots)
 
-        if mode in IterationMode:
-            self.__mode = mode
-        else:
+        factory: Optional[_IteratorFactory] = _ITER_FACTORIES.get(mode)
+        if factory is None:
             raise ValueError("Not a valid IterationMode")
 
-    def __iter__(self) -> Iterator[NodeElement]:
-        iterator: _DataClassIteratorBase
-
-        if IterationMode.BREAD_FIRST_SEARCH == self.__mode:
-            iterator = _BreathFirstDataClassIterator(self.__tree)
-        elif IterationMode.POST_ORDER_DEPTH_FIRST_SEARCH == self.__mode:
-            iterator = _PostOrderDepthFirstDataClassIterator(
-                self.__tree, False
-            )
-        elif IterationMode.PRE_ORDER_DEPTH_FIRST_SEARCH == self.__mode:
-            iterator = _PreOrderDepthFirstDataClassIterator(self.__tree, False)
-        elif (
-            IterationMode.REVERSE_POST_ORDER_DEPTH_FIRST_SEARCH == self.__mode
-        ):
-            iterator = _PostOrderDepthFirstDataClassIterator(self.__tree, True)
-        elif IterationMode.REVERSE_PRE_ORDER_DEPTH_FIRST_SEARCH == self.__mode:
-            iterator = _PreOrderDepthFirstDataClassIterator(self.__tree, True)
-        else:
-            raise NotImplementedError(self.__mode)  # Heuristically unreachable
+        self.__factory: _IteratorFactory = factory
 
-        return iterator
+    def __iter__(self) -> Iterator[NodeElement]:
+        return self.__factory(self.__roots)
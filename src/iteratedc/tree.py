@@ -10,7 +10,7 @@
 """Implementation of a raw tree structure for dataclasses including the nodes of the tree.
 """
 
-from dataclasses import is_dataclass, fields, Field, asdict
+from dataclasses import is_dataclass, fields, Field
 from typing import (
     Iterable,
     Iterator,
@@ -18,74 +18,148 @@ from typing import (
     Optional,
     Type,
     Any,
+    Callable,
+    Dict,
     Tuple,
     NamedTuple,
     Mapping,
     get_args,
+    get_origin,
 )
 from collections.abc import Iterable as _Iterable_Collection
+from enum import Enum, auto
+from weakref import WeakKeyDictionary
 
 
-class _FieldValueWithMetaData(NamedTuple):
-    value: Any
-    corresponding_field: Optional[Field] = None
-    field_index: Optional[int] = None
+class _FieldValueWithMetaData:
+    """Read-only record of a field value. The attributes must not be
+       reassigned after construction, as nodes share the instance.
+    """
+
+    __slots__ = ("value", "corresponding_field", "field_index")
+
+    def __init__(
+        self,
+        value: Any,
+        corresponding_field: Optional[Field] = None,
+        field_index: Optional[int] = None,
+    ) -> None:
+        self.value: Any = value
+        self.corresponding_field: Optional[Field] = corresponding_field
+        self.field_index: Optional[int] = field_index
 
 
 def _is_generic_collection_type(type_to_check: Type) -> bool:
-    has_origin: bool = hasattr(type_to_check, "__origin__")
-    if not has_origin:
+    origin: Optional[Type] = get_origin(type_to_check)
+    if origin is None or not isinstance(origin, type):
         return False
 
-    origin: Type = type_to_check.__origin__
-
     return (
         issubclass(origin, _Iterable_Collection)
         and len(get_args(type_to_check)) > 0
     )
 
 
+class _FieldKind(Enum):
+    SCALAR_DATA_CLASS = auto()
+    COLLECTION_OF_DATA_CLASSES = auto()
+
+
+class _FieldPlanEntry(NamedTuple):
+    corresponding_field: Field
+    kind: _FieldKind
+
+
+def _field_plan(data_class_type: Type) -> Tuple[_FieldPlanEntry, ...]:
+    flds: Tuple[Field, ...] = fields(data_class_type)
+    scalars: List[_FieldPlanEntry] = []
+    collections: List[_FieldPlanEntry] = []
+    for fld in flds:
+        if is_dataclass(fld.type):
+            scalars.append(
+                _FieldPlanEntry(fld, _FieldKind.SCALAR_DATA_CLASS)
+            )
+        elif _is_generic_collection_type(fld.type):
+            args: Tuple[Type, ...] = get_args(fld.type)
+            if len(args) > 1:
+                # Cannot iterate over multiple items in this stage
+                continue
+            type_arg: Type = args[0]
+            if is_dataclass(type_arg):
+                collections.append(
+                    _FieldPlanEntry(fld, _FieldKind.COLLECTION_OF_DATA_CLASSES)
+                )
+
+    return tuple(scalars + collections)
+
+
+_Walker = Callable[[Any], Iterator[_FieldValueWithMetaData]]
+
+
+# Weakly keyed, so that dataclasses created at runtime can be collected
+_WALKERS: "WeakKeyDictionary[Type, _Walker]" = WeakKeyDictionary()
+
+
+def _compile_walker(data_class_type: Type) -> _Walker:
+    plan: Tuple[_FieldPlanEntry, ...] = _field_plan(data_class_type)
+    if len(plan) == 0:
+        return lambda data_class: iter(())
+
+    # Emit straight-line code for the field plan, like dataclasses does
+    # for __init__, so that walking an instance needs no reflection.
+    # Fields are looked up from the instance, as referencing them here
+    # would keep the weakly cached type alive through Field.type.
+    namespace: Dict[str, Any] = {"_FieldValue": _FieldValueWithMetaData}
+    lines: List[str] = [
+        "def walk(data_class):",
+        "    fields = data_class.__dataclass_fields__",
+    ]
+    for fld, kind in plan:
+        field_ref: str = f"fields[{fld.name!r}]"
+        value: str = f"data_class.{fld.name}"
+        if kind is _FieldKind.SCALAR_DATA_CLASS:
+            lines.append(f"    yield _FieldValue({value}, {field_ref}, None)")
+        else:
+            lines.append(f"    for i, item in enumerate({value}, 1):")
+            lines.append(f"        yield _FieldValue(item, {field_ref}, i)")
+
+    exec("\n".join(lines), namespace)  # pylint: disable=W0122
+    return namespace["walk"]
+
+
+def _get_walker(data_class_type: Type) -> _Walker:
+    walker: Optional[_Walker] = _WALKERS.get(data_class_type)
+    if walker is None:
+        walker = _compile_walker(data_class_type)
+        _WALKERS[data_class_type] = walker
+
+    return walker
+
+
 def _iterate_over_current_item(
     data_class: Any,
 ) -> Iterator[_FieldValueWithMetaData]:
     if data_class is None or not is_dataclass(data_class):
-        yield from []
-
-    else:
-        flds: Tuple[Field, ...] = fields(data_class)
-        data_class_value: Mapping[str, Any] = asdict(data_class)
-        for fld in flds:
-            if is_dataclass(fld.type):
-                yield _FieldValueWithMetaData(
-                    data_class_value[fld.name], fld, None
-                )
+        return iter(())
 
-        for fld in flds:
-            if _is_generic_collection_type(fld.type):
-                args: Tuple[Type, ...] = get_args(fld.type)
-                if len(args) > 1:
-                    # Cannot iterate over multiple items in this stage
-                    continue
-                type_arg: Type = args[0]
-                if is_dataclass(type_arg):
-                    items: Iterable[Any] = data_class_value[fld.name]
-                    i = 0
-                    for item in items:
-                        i = i + 1
-                        yield _FieldValueWithMetaData(item, fld, i)
+    return _get_walker(type(data_class))(data_class)
 
 
 class Node:
     """Implementation of a tree node for dataclass members.
     """
 
+    __slots__ = ("__field", "__children")
+
     def __init__(
         self,
         value: _FieldValueWithMetaData,
         children: Optional[Iterable["Node"]] = None,
     ) -> None:
         self.__field = value
-        self.__children = list(children or [])
+        self.__children: Tuple["Node", ...] = (
+            tuple(children) if children else ()
+        )
 
     @property
     def item(self) -> Any:
@@ -145,11 +219,12 @@ class Node:
         return fld.type
 
     @property
-    def children(self) -> Iterable["Node"]:
-        """The child nodes.
+    def children(self) -> Tuple["Node", ...]:
+        """The child nodes. Nodes created while iterating over dataclasses
+           hold no children, as these are visited as separate elements.
 
         Returns:
-            [type]: The nodes following the current node.
+            Tuple[Node, ...]: The nodes following the current node.
         """
         return self.__children
 
@@ -158,6 +233,8 @@ class Tree:
     """Implements a tree as a sequence of nodes.
     """
 
+    __slots__ = ("__root",)
+
     def __init__(self, root: Node) -> None:
         self.__root = root
 
@@ -171,8 +248,7 @@ class Tree:
         return self.__root
 
 
-def _create_node_from_item(field_with_meta: _FieldValueWithMetaData) -> Node:
-
+def _ensure_data_class_item(field_with_meta: _FieldValueWithMetaData) -> None:
     if field_with_meta is None:
         raise ValueError(field_with_meta, " must not be None")
 
@@ -181,8 +257,31 @@ def _create_node_from_item(field_with_meta: _FieldValueWithMetaData) -> Node:
     if not is_dataclass(data_class):
         raise ValueError(data_class, " must be a data class")
 
+
+def _create_leaf_node(field_with_meta: _FieldValueWithMetaData) -> Node:
+    _ensure_data_class_item(field_with_meta)
+    return Node(field_with_meta)
+
+
+def _create_root_node(data_class: Any) -> Optional[Node]:
+    if data_class is None or not is_dataclass(data_class):
+        return None
+
+    return Node(_FieldValueWithMetaData(data_class, None, None))
+
+
+def _create_child_nodes(node: Node) -> Tuple[Node, ...]:
+    return tuple(
+        _create_leaf_node(meta_field)
+        for meta_field in _iterate_over_current_item(node.item)
+    )
+
+
+def _create_node_from_item(field_with_meta: _FieldValueWithMetaData) -> Node:
+    _ensure_data_class_item(field_with_meta)
+
     child_nodes: List[Node] = []
-    for meta_field in _iterate_over_current_item(data_class):
+    for meta_field in _iterate_over_current_item(field_with_meta.value):
         node: Node = _create_node_from_item(meta_field)
         child_nodes.append(node)
 
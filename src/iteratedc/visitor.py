@@ -12,7 +12,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Type, Tuple, Iterable, cast
+from typing import Tuple, Iterable, cast
 from .tree import Node
 
 
@@ -20,6 +20,8 @@ class VisitableElement(ABC):
     """Basic implementation marking an instance as visitable.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def accept_visitor(self, visitor: "VisitorBase") -> None:
         """Accepts a visitor instance for this instance.
@@ -42,13 +44,12 @@ class VisitorBase(ABC):
         """
 
 
-_NodeVisitorType: Type = type(None)
-
-
 class NodeElement(VisitableElement):
     """Concrete implementation of a visitable element for node elements.
     """
 
+    __slots__ = ("__node", "__parent_nodes")
+
     def __init__(self, node: Node, parent_nodes: Iterable[Node]) -> None:
         super().__init__()
         self.__node: Node = node
@@ -70,13 +71,12 @@ class NodeElement(VisitableElement):
         Returns:
             Tuple[Node, ...]: The nodes preceding the current nodes.
         """
-        return tuple(self.__parent_nodes)
+        return self.__parent_nodes
 
     def accept_visitor(self, visitor: VisitorBase) -> None:
-        node_visitor_type: Type = globals()['_NodeVisitorType']
-        if isinstance(visitor, node_visitor_type):
-            node_visitor: "NodeVisitor" = cast(node_visitor_type, visitor)
-            node_visitor.visit_node_element(self)
+        visit = getattr(visitor, "visit_node_element", None)
+        if visit is not None:
+            visit(self)
 
 
 class NodeVisitor(VisitorBase, ABC):
@@ -99,5 +99,3 @@ class NodeVisitor(VisitorBase, ABC):
         Returns:
             Node: The current node that has been visited.
         """
-
-_NodeVisitorType = type(NodeVisitor)
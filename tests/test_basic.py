@@ -7,8 +7,16 @@
 # License: 3-clause BSD, see https://opensource.org/licenses/BSD-3-Clause
 #
 
+import gc
 import unittest
+import weakref
 from dataclasses import dataclass, field
+from typing import List, Optional
+
+try:
+    from typing import Annotated
+except ImportError:  # Python 3.8
+    Annotated = None
 
 import iteratedc
 
@@ -20,12 +28,271 @@ class Simple:
     c: int = field()
 
 
+@dataclass
+class Nested:
+    simple: Simple = field()
+    value: int = field()
+
+
+@dataclass
+class Collection:
+    items: List[Simple] = field()
+    nested: Nested = field()
+
+
+@dataclass
+class WithOptional:
+    simple: Simple = field()
+    optional: Optional[int] = field(default=None)
+
+
+class NotCopyable:
+    def __deepcopy__(self, memo):
+        raise AssertionError("must not be copied")
+
+
+@dataclass
+class WithPayload:
+    simple: Simple = field()
+    payload: NotCopyable = field()
+
+
+@dataclass
+class Base:
+    pass
+
+
+@dataclass
+class Cyclic(Base):
+    kids: List[Base] = field(default_factory=list)
+
+
 class BasicTest(unittest.TestCase):
     def test_sample(self) -> None:
         simple: Simple = Simple(1, 2, 3)
         items = iteratedc.flatten_hierarchy(simple)
         self.assertEqual(len(items), 1)
 
+    def test_child_identity(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        nested: Nested = Nested(simple, 4)
+        items = iteratedc.flatten_hierarchy(nested)
+        self.assertEqual(len(items), 2)
+        self.assertIs(items[0].node.item, nested)
+        self.assertIs(items[1].node.item, simple)
+
+    def test_collection_children(self) -> None:
+        first: Simple = Simple(1, 2, 3)
+        second: Simple = Simple(4, 5, 6)
+        nested: Nested = Nested(Simple(7, 8, 9), 10)
+        collection: Collection = Collection([first, second], nested)
+        items = iteratedc.flatten_hierarchy(collection)
+        self.assertEqual(
+            [item.node.item for item in items],
+            [collection, nested, first, second, nested.simple],
+        )
+        self.assertEqual(
+            [item.node.item_index for item in items], [None, None, 1, 2, None]
+        )
+
+    def test_parent_nodes(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        nested: Nested = Nested(simple, 4)
+        items = iteratedc.flatten_hierarchy(nested)
+        self.assertEqual(items[0].parent_nodes, ())
+        self.assertEqual(
+            [node.item for node in items[1].parent_nodes], [nested]
+        )
+
+    def test_depth_first_modes(self) -> None:
+        first: Simple = Simple(1, 2, 3)
+        second: Simple = Simple(4, 5, 6)
+        nested: Nested = Nested(Simple(7, 8, 9), 10)
+        collection: Collection = Collection([first, second], nested)
+        inner: Simple = nested.simple
+        expectations = {
+            iteratedc.IterationMode.PRE_ORDER_DEPTH_FIRST_SEARCH: [
+                collection, nested, inner, first, second
+            ],
+            iteratedc.IterationMode.POST_ORDER_DEPTH_FIRST_SEARCH: [
+                inner, nested, first, second, collection
+            ],
+            iteratedc.IterationMode.REVERSE_PRE_ORDER_DEPTH_FIRST_SEARCH: [
+                second, first, inner, nested, collection
+            ],
+            iteratedc.IterationMode.REVERSE_POST_ORDER_DEPTH_FIRST_SEARCH: [
+                collection, second, first, nested, inner
+            ],
+        }
+        for mode, expected in expectations.items():
+            with self.subTest(mode=mode):
+                items = iteratedc.flatten_hierarchy(collection, mode)
+                self.assertEqual([item.node.item for item in items], expected)
+                inner_item = next(i for i in items if i.node.item is inner)
+                self.assertEqual(
+                    [node.item for node in inner_item.parent_nodes],
+                    [collection, nested],
+                )
+
+    def test_iterator_protocol(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        nested: Nested = Nested(simple, 4)
+        nodes = iteratedc.iterate_over_data_class(nested)
+        self.assertIs(iter(nodes), nodes)
+        self.assertIs(next(nodes).node.item, nested)
+        self.assertEqual([item.node.item for item in nodes], [simple])
+
+    def test_shared_instances(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        nested: Nested = Nested(simple, 4)
+        collection: Collection = Collection([simple, simple], nested)
+        items = iteratedc.flatten_hierarchy(collection)
+        self.assertEqual(
+            sum(1 for item in items if item.node.item is simple), 3
+        )
+
+    def test_invalid_child_raises_while_iterating(self) -> None:
+        nested: Nested = Nested(Simple(1, 2, 3), 4)
+        collection: Collection = Collection([None], nested)
+        nodes = iteratedc.iterate_over_data_class(collection)
+        self.assertIs(next(nodes).node.item, collection)
+        with self.assertRaises(ValueError):
+            next(nodes)
+
+    def test_accept_visitor(self) -> None:
+        class _Visitor(iteratedc.NodeVisitor):
+            def __init__(self) -> None:
+                super().__init__()
+                self.visited = []
+
+            def visit_node_element(self, element):
+                self.visited.append(element.node.item)
+                return element.node
+
+        simple: Simple = Simple(1, 2, 3)
+        nested: Nested = Nested(simple, 4)
+        visitor = _Visitor()
+        for item in iteratedc.iterate_over_data_class(nested):
+            item.accept_visitor(visitor)
+        self.assertEqual(visitor.visited, [nested, simple])
+
+    def test_optional_field(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        items = iteratedc.flatten_hierarchy(WithOptional(simple))
+        self.assertEqual(len(items), 2)
+        self.assertIs(items[1].node.item, simple)
+
+    def test_invalid_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            iteratedc.DataClassIterable("BFS", Simple(1, 2, 3))
+
+    def test_payload_not_copied(self) -> None:
+        simple: Simple = Simple(1, 2, 3)
+        payload: NotCopyable = NotCopyable()
+        items = iteratedc.flatten_hierarchy(WithPayload(simple, payload))
+        self.assertEqual(len(items), 2)
+        self.assertIs(items[0].node.item.payload, payload)
+
+    def test_multiple_data_classes(self) -> None:
+        first: Nested = Nested(Simple(1, 2, 3), 4)
+        second: Simple = Simple(5, 6, 7)
+        expectations = {
+            iteratedc.IterationMode.BREAD_FIRST_SEARCH: [
+                first, second, first.simple
+            ],
+            iteratedc.IterationMode.PRE_ORDER_DEPTH_FIRST_SEARCH: [
+                first, first.simple, second
+            ],
+            iteratedc.IterationMode.POST_ORDER_DEPTH_FIRST_SEARCH: [
+                first.simple, first, second
+            ],
+            iteratedc.IterationMode.REVERSE_POST_ORDER_DEPTH_FIRST_SEARCH: [
+                second, first, first.simple
+            ],
+        }
+        for mode, expected in expectations.items():
+            with self.subTest(mode=mode):
+                items = list(
+                    iteratedc.iterate_over_data_classes([first, second], mode)
+                )
+                self.assertEqual([item.node.item for item in items], expected)
+                parents = {
+                    id(item.node.item): [n.item for n in item.parent_nodes]
+                    for item in items
+                }
+                self.assertEqual(parents[id(first.simple)], [first])
+                self.assertEqual(parents[id(second)], [])
+
+    @unittest.skipIf(Annotated is None, "typing.Annotated is not available")
+    def test_unhashable_annotation(self) -> None:
+        @dataclass
+        class WithAnnotation:
+            simple: Simple = field()
+            length: Annotated[int, {"unit": "m"}] = field(default=0)
+
+        simple: Simple = Simple(1, 2, 3)
+        items = iteratedc.flatten_hierarchy(WithAnnotation(simple))
+        self.assertEqual([item.node.item for item in items][1:], [simple])
+
+    def test_cyclic_hierarchy(self) -> None:
+        cyclic: Cyclic = Cyclic()
+        cyclic.kids.append(Cyclic())
+        cyclic.kids[0].kids.append(cyclic)
+        for mode in iteratedc.IterationMode:
+            with self.subTest(mode=mode):
+                with self.assertRaises(ValueError):
+                    iteratedc.flatten_hierarchy(cyclic, mode)
+
+    def test_tree_is_snapshot(self) -> None:
+        first: Simple = Simple(1, 2, 3)
+        collection: Collection = Collection([first], Nested(first, 4))
+        tree = iteratedc.tree.create_tree_from_dataclass(collection)
+        collection.items.append(Simple(5, 6, 7))
+        self.assertEqual(len(tree.root.children), 2)
+
+    def test_iteration_reads_current_state(self) -> None:
+        first: Simple = Simple(1, 2, 3)
+        collection: Collection = Collection([first], Nested(first, 4))
+        iterable = iteratedc.DataClassIterable(
+            iteratedc.IterationMode.BREAD_FIRST_SEARCH, collection
+        )
+        self.assertEqual(len(list(iterable)), 4)
+        collection.items.append(Simple(5, 6, 7))
+        items = list(iterable)
+        self.assertEqual(len(items), 5)
+        self.assertEqual([item.node.children for item in items], [()] * 5)
+
+    def test_nodes_released_after_iteration(self) -> None:
+        def count_nodes() -> int:
+            gc.collect()
+            return sum(
+                1 for o in gc.get_objects() if isinstance(o, iteratedc.Node)
+            )
+
+        collection: Collection = Collection(
+            [Simple(i, i, i) for i in range(50)], Nested(Simple(1, 2, 3), 4)
+        )
+        before: int = count_nodes()
+        iterable = iteratedc.DataClassIterable(
+            iteratedc.IterationMode.BREAD_FIRST_SEARCH, collection
+        )
+        self.assertEqual(len(list(iterable)), 53)
+        # Only the root node is kept by the iterable
+        self.assertEqual(count_nodes() - before, 1)
+
+    def test_runtime_data_classes_are_collectable(self) -> None:
+        @dataclass
+        class Runtime:
+            simple: Simple = field()
+            items: List[Simple] = field(default_factory=list)
+
+        runtime = Runtime(Simple(1, 2, 3), [Simple(4, 5, 6)])
+        self.assertEqual(len(iteratedc.flatten_hierarchy(runtime)), 3)
+        reference = weakref.ref(Runtime)
+        del runtime, Runtime
+        gc.collect()
+        self.assertIsNone(reference())
+
 
 if __name__ == "__main__":
     unittest.main()